@@ -1,15 +1,23 @@
-import dash
-import dash_html_components as html
-import dash_core_components as dcc
+from concurrent.futures import ThreadPoolExecutor
+from dash import html
 import components
 
-app = dash.Dash(__name__)
+app = components.StaticLayoutDash(__name__)
 
-timecourse = components.TopicTimecourse('data/topics.csv')
-cpm_plotter = components.CPMPlotter('data/cpm.gct')
-z_table = components.GeneTable('data/topic_Z.csv',
+# the input files are independent, so read them in parallel
+with ThreadPoolExecutor(max_workers = 4) as executor:
+    timecourse_future = executor.submit(components.TopicTimecourse, 
+                                        'data/topics.csv')
+    cpm_future = executor.submit(components.CPMPlotter, 'data/cpm.gct')
+    z_future = executor.submit(components.read_scores, 'data/topic_Z.csv')
+    lfc_future = executor.submit(components.read_scores, 
+                                 'data/topic_lfc.csv')
+
+timecourse = timecourse_future.result()
+cpm_plotter = cpm_future.result()
+z_table = components.GeneTable(z_future.result(),
                                cpm_plotter, app, 'Z')
-lfc_table = components.GeneTable('data/topic_lfc.csv',
+lfc_table = components.GeneTable(lfc_future.result(),
                                  cpm_plotter, app, 'beta')
 
 app.layout = html.Div(children = [
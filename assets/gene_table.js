@@ -0,0 +1,47 @@
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    gene_table: {
+        // Makes a html table cell component
+        cell: function(children) {
+            return {
+                type: 'Td',
+                namespace: 'dash_html_components',
+                props: {children: children}
+            };
+        },
+
+        // Makes a html table row component from the server's row data
+        row: function(data) {
+            var cell = window.dash_clientside.gene_table.cell;
+            return {
+                type: 'Tr',
+                namespace: 'dash_html_components',
+                props: {children: [cell(data.rank), cell(data.gene),
+                                   cell(data.score), cell(data.cpm)]}
+            };
+        },
+
+        // Shows a page of a gene table from the rows cached by the server.
+        // Inputs are the page cache and the forward and back buttons.
+        show_page: function(page_cache, forward, back, start_rank) {
+            var ctx = window.dash_clientside.callback_context;
+            var trigger = ctx.triggered.length ? ctx.triggered[0].prop_id : '';
+            var ngenes = page_cache.ngenes;
+            var rank = page_cache.page;
+            if (trigger === ctx.inputs_list[1].id + '.n_clicks') {
+                rank = start_rank + ngenes;
+            } else if (trigger === ctx.inputs_list[2].id + '.n_clicks') {
+                rank = start_rank - ngenes;
+            }
+            rank = Math.min(Math.max(rank, 0), page_cache.total - ngenes);
+
+            var offset = rank - page_cache.start;
+            if (offset < 0 || offset + ngenes > page_cache.rows.length) {
+                // outside the cached window, the server sends a new one
+                var no_update = window.dash_clientside.no_update;
+                return [no_update, no_update];
+            }
+            var rows = page_cache.rows.slice(offset, offset + ngenes);
+            return [rows.map(window.dash_clientside.gene_table.row), rank];
+        }
+    }
+});
@@ -1,24 +1,89 @@
-from typing import Dict
+from typing import Dict, List
+from base64 import b64encode
+import functools
+import hashlib
+import os
+import re
+import tempfile
 import pandas as pd
 import numpy as np
 import dash 
-import dash_html_components as html
-import dash_core_components as dcc
-import plotly.express as px
+from dash import html, dcc, Input, Output, State, ClientsideFunction
+import flask
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 
 def _order_strings(str_series: pd.Series) -> pd.Series:
     '''Turns string series of the form cNN where c is a character and 
        NN is an integer into an order categorical'''
-    # get unique ints
-    num_series = str_series.str.slice(start = 1).astype(int)
-    unique_num = np.unique(num_series)
-    # append c to ints
-    c = str_series[0][0]
-    unique_str = c + pd.Series(unique_num).astype(str)
+    # only the few distinct strings need parsing
+    unique_str = pd.unique(str_series.to_numpy())
+    unique_num = sorted({int(s[1:]) for s in unique_str})
+    c = unique_str[0][0]
     # categorize the original series
-    category_type = pd.CategoricalDtype(unique_str, ordered = True)
+    category_type = _ordered_category(c, tuple(unique_num))
     return str_series.astype(category_type)
+
+@functools.lru_cache(maxsize = None)
+def _ordered_category(c: str, nums: tuple) -> pd.CategoricalDtype:
+    '''Makes the ordered categorical of c followed by each of nums, shared
+       between series with the same values'''
+    return pd.CategoricalDtype([c + str(num) for num in nums], ordered = True)
+
+def _group_means(values: np.ndarray, groups: np.ndarray, 
+                 n_groups: int) -> np.ndarray:
+    '''Averages the rows of values that share an integer group code in 
+       [0, n_groups), skipping nan like pandas and leaving groups without 
+       any values as nan'''
+    # sort the rows by group and sum each run of them
+    order = np.argsort(groups, kind = 'stable')
+    sorted_groups = groups[order]
+    starts = np.flatnonzero(np.diff(sorted_groups, prepend = -1))
+    missing = np.isnan(values)[order]
+    sums = np.add.reduceat(np.where(missing, 0, values[order]), 
+                           starts, axis = 0)
+    counts = np.add.reduceat(~missing, starts, axis = 0)
+    means = np.full((n_groups,) + values.shape[1:], np.nan)
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        means[sorted_groups[starts]] = np.where(counts > 0, 
+                                                sums / counts, np.nan)
+    return means
+
+def _cached_read_csv(path: str, **read_csv_kwargs) -> pd.DataFrame:
+    '''Reads a csv with pd.read_csv, keeping a pickle of the parsed table 
+       next to it so later starts skip parsing until the csv changes'''
+    key = hashlib.md5(
+        repr((pd.__version__, sorted(read_csv_kwargs.items()))).encode()
+    )
+    cache_path = f'{path}.{key.hexdigest()}.pkl'
+    if (os.path.exists(cache_path) and 
+        os.path.getmtime(cache_path) >= os.path.getmtime(path)):
+        try:
+            return pd.read_pickle(cache_path)
+        except Exception:
+            # truncated or unreadable cache, reparse and rewrite it
+            pass
+    table = pd.read_csv(path, **read_csv_kwargs)
+    try:
+        # write beside the cache and swap it in so readers never see
+        # a partial file
+        fd, tmp_path = tempfile.mkstemp(dir = os.path.dirname(cache_path), 
+                                        suffix = '.tmp')
+        os.close(fd)
+        try:
+            table.to_pickle(tmp_path)
+            os.replace(tmp_path, cache_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except OSError:
+        # read-only data directory, just parse every time
+        pass
+    return table
+
+def read_scores(score_path: str) -> pd.DataFrame:
+    '''Reads a table of gene scores with a gene column and a column per topic'''
+    return _cached_read_csv(score_path)
     
 topic_palette = ['#F0A3FF', '#0075DC', '#993F00', '#4C005C',
                  '#191919', '#005C31', '#2BCE48', '#FFCC99', 
@@ -29,12 +94,32 @@ topic_palette = ['#F0A3FF', '#0075DC', '#993F00', '#4C005C',
                  '#FFFF00', '#FF5005']
 topic_color_map = {'k' + str(i+1): c for i, c in enumerate(topic_palette)}
 
+# splits sample names of the form organ_timepoint_mouse
+_sample_re = re.compile(r'(.*)_(.*)_(.*)')
+
 organ_palette = ["#FFFF00", "#1CE6FF", "#FF34FF", "#FF4A46", 
                  "#008941", "#006FA6", "#A30059", "#FFDBE5",
                  "#7A4900", "#0000A6", "#63FFAC", "#B79762", "#004D43"]
 
 
 
+class StaticLayoutDash(dash.Dash):
+
+    '''Dash app that serializes its layout once and serves the cached json 
+       on every page load. Only for layouts that don't change after the 
+       first request.
+    
+    '''
+
+    _layout_json = None
+
+    def serve_layout(self) -> flask.Response:
+        if self._layout_json is None:
+            self._layout_json = super().serve_layout().get_data()
+        return flask.Response(self._layout_json, 
+                              mimetype = 'application/json')
+
+
 class TopicTimecourse:
 
     '''Manages the component for the main topics timecourse.
@@ -48,49 +133,106 @@ class TopicTimecourse:
     def __init__(self, topic_path: str):
         self.id = 'topic-timecourse'
         self._prep_topic_table(topic_path)
+        # the figure never changes, so build it once for every page load
+        self._fig = self._get_fig().to_dict()
 
     def _prep_topic_table(self, topic_path):
-        topic_table = pd.read_csv(topic_path)
+        topic_table = _cached_read_csv(topic_path)
         topic_table = topic_table.rename(columns = {'Unnamed: 0': 'sample'})
         
-        meta_cols = topic_table['sample'].str.extract(
-            r'(?P<organ>.*)_(?P<timepoint>.*)_(?P<mouse>.*)'
-        )
-        topic_table = pd.concat([topic_table, meta_cols], axis=1)
-        topic_table = topic_table.melt(
-            id_vars = ['sample', 'organ', 'timepoint', 'mouse'],
-            var_name = 'topic'
+        meta_cols = pd.DataFrame(
+            [_sample_re.match(sample).groups() 
+             for sample in topic_table['sample'].to_numpy()],
+            columns = ['organ', 'timepoint', 'mouse']
         )
+        # group on categorical codes rather than strings
+        meta_cols['organ'] = meta_cols['organ'].astype('category')
+        meta_cols['timepoint'] = _order_strings(meta_cols['timepoint'])
+        organs = meta_cols['organ'].cat.categories
+        timepoints = meta_cols['timepoint'].cat.categories
+        group = (meta_cols['organ'].cat.codes.to_numpy().astype(int) 
+                 * len(timepoints)
+                 + meta_cols['timepoint'].cat.codes.to_numpy())
+        topic_cols = topic_table.columns.drop('sample')
 
-        topic_table['timepoint'] = _order_strings(topic_table['timepoint'])
-        topic_table['topic'] = _order_strings(topic_table['topic'])
+        # average over mice while still wide
+        means = _group_means(topic_table[topic_cols].to_numpy(), 
+                             group, len(organs) * len(timepoints))
+        # organ x timepoint x topic means, topics in order, for the figure
+        topic_order = np.argsort(
+            _order_strings(pd.Series(topic_cols)).cat.codes.to_numpy()
+        )
+        self._organs = list(organs)
+        self._timepoints = list(timepoints)
+        self._topics = list(topic_cols[topic_order])
+        self._topic_means = (means[:, topic_order]
+                             .reshape(len(organs), len(timepoints), -1))
 
-        topic_mean = (topic_table
-                      .groupby(['organ', 'timepoint', 'topic'])
-                      .mean()
-                      .reset_index()
-                     )
+        # long form straight from the means, already in
+        # (organ, timepoint, topic) order, skipping groups with no samples
+        n_topics = len(self._topics)
+        has_samples = ~np.isnan(self._topic_means).all(axis = 2).ravel()
+        cell_codes = np.flatnonzero(has_samples)
+        topic_dtype = pd.CategoricalDtype(self._topics, ordered = True)
+        topic_mean = pd.DataFrame({
+            'organ': pd.Categorical.from_codes(
+                np.repeat(cell_codes // len(timepoints), n_topics),
+                dtype = meta_cols['organ'].dtype
+            ),
+            'timepoint': pd.Categorical.from_codes(
+                np.repeat(cell_codes % len(timepoints), n_topics),
+                dtype = meta_cols['timepoint'].dtype
+            ),
+            'topic': pd.Categorical.from_codes(
+                np.tile(np.arange(n_topics), len(cell_codes)),
+                dtype = topic_dtype
+            ),
+            'value': self._topic_means.reshape(-1, n_topics)[has_samples].ravel()
+        })
 
         self.topic_table = topic_mean
 
     def _get_fig(self) -> go.Figure:
-        fig = px.bar(self.topic_table, 
-                     x = 'timepoint', y = 'value', color = 'topic',
-                     custom_data = ['topic', 'organ'],
-                     color_discrete_map = topic_color_map,
-                     facet_row = 'organ',
-                     facet_row_spacing = 0.01,
-                     height = 900,
-                     width = 500)
-        # clean up facet names
-        fig.for_each_annotation(
-            lambda a: a.update(text=a.text.replace("organ=", ""))
-        )
+        '''Makes a stacked bar plot of topics over time with a row per organ'''
+        fig = make_subplots(rows = len(self._organs), 
+                            cols = 1,
+                            shared_xaxes = True,
+                            vertical_spacing = 0.01,
+                            row_titles = self._organs)
+        traces = []
+        rows = []
+        for j, topic in enumerate(self._topics):
+            for i, organ in enumerate(self._organs):
+                hover = (f'topic={topic}<br>organ={organ}<br>'
+                         'timepoint=%{x}<br>value=%{y}<extra></extra>')
+                traces.append(go.Bar(
+                    x = self._timepoints,
+                    y = self._topic_means[i, :, j],
+                    name = topic,
+                    legendgroup = topic,
+                    showlegend = i == 0,
+                    marker_color = topic_color_map.get(
+                        topic, topic_palette[j % len(topic_palette)]
+                    ),
+                    customdata = [[topic, organ]] * len(self._timepoints),
+                    hovertemplate = hover
+                ))
+                rows.append(i + 1)
+        fig.add_traces(traces, rows = rows, cols = [1] * len(rows))
+        # row titles use the template font like px facet labels
+        fig.for_each_annotation(lambda a: a.update(font_size = None))
+        fig.update_yaxes(matches = 'y', title_text = 'value')
+        fig.update_xaxes(title_text = 'timepoint', row = len(self._organs))
+        fig.update_layout(barmode = 'relative',
+                          legend = dict(title_text = 'topic', 
+                                        tracegroupgap = 0),
+                          margin = dict(t = 60),
+                          height = 900,
+                          width = 500)
         return fig
 
     def get_component(self) -> dcc.Graph():
-        fig = self._get_fig()
-        graph = dcc.Graph(figure = fig, id = self.id)
+        graph = dcc.Graph(figure = self._fig, id = self.id)
         return graph
         
 
@@ -99,55 +241,105 @@ class CPMPlotter:
     '''Makes timecourse plots of cpm for the gene table.
     
     Attributes:
-        cpm: pd.Dataframe - cpm data
+        cpm: np.ndarray - mean cpm of gene x organ x timepoint
+        genes: pd.Index - genes in the order of the cpm rows
+        organs: np.ndarray - sorted organ names, in the order of the cpm axis
         color_map: Dict[str: str] - map of organs to colors
         organ_key: html.Ul - html object for organ color key
             
     '''
 
     def __init__(self, cpm_path: str):
+        col_meta, cpm = self._read_gct(cpm_path)
+        
+        self.organs = np.unique(col_meta['organ'])
+        # reuse the palette if there are more organs than colors
+        self.color_map = {organ: organ_palette[i % len(organ_palette)]
+                          for i, organ in enumerate(self.organs)}
+        self._prep_organ_key()
+        self._prep_cpm(cpm, col_meta)
+        # plots only depend on the gene, so keep them around for paging
+        self._cached_line_plot = functools.lru_cache(maxsize = 4096)(
+            self._build_line_plot
+        )
+
+    def _read_gct(self, cpm_path: str):
+        '''Reads the sample metadata rows and the gene x sample cpm block of 
+           the .gct separately, so the cpm parses as a plain numeric table'''
         # this is a rather brittle way to read in the .gct
-        cpm = pd.read_csv(cpm_path, 
-                          sep = '\t', 
-                          header  = list(range(2, 8)),
-                          index_col = 0)
+        with open(cpm_path) as gct:
+            header = [next(gct).rstrip('\n').split('\t') for _ in range(8)]
+        col_meta = pd.DataFrame({line[0]: line[1:] for line in header[2:]})
         # set proper timepoint order
-        cpm_cols = cpm.columns.to_frame()
-        cpm_cols['timepoint'] = _order_strings(cpm_cols['timepoint'])
-        cpm.columns = pd.MultiIndex.from_frame(cpm_cols)
+        col_meta['timepoint'] = _order_strings(col_meta['timepoint'])
         
-        cpm = cpm.groupby(['organ', 'timepoint'], axis=1).mean()
-        self.cpm = cpm
-        
-        organs = np.unique(cpm_cols['organ'])
-        self.color_map = {organ: color 
-                          for organ, color in zip(organs, organ_palette)}
-        self._prep_organ_key()
+        # cpm only needs float32, which halves the parsed table
+        cpm = _cached_read_csv(cpm_path,
+                               sep = '\t',
+                               skiprows = 8,
+                               header = None,
+                               index_col = 0,
+                               dtype = dict.fromkeys(
+                                   range(1, len(col_meta) + 1), np.float32
+                               ))
+        return col_meta, cpm
         
     def _prep_organ_key(self):
         key = html.Ul(style = {'list-style-type': 'none',
                                'padding-left': 20},
                       children = [self._key_item(organ) 
-                                  for organ in self.color_map])
+                                  for organ in self.organs])
         self.organ_key = key
+
+    def _prep_cpm(self, cpm: pd.DataFrame, col_meta: pd.DataFrame):
+        '''Averages the samples of each organ and timepoint into a float32 
+           array so plotting skips pandas'''
+        organs = self.organs
+        timepoints = col_meta['timepoint'].cat.categories
+        group = (np.searchsorted(organs, col_meta['organ']) * len(timepoints) 
+                 + col_meta['timepoint'].cat.codes.to_numpy())
+        # empty cells are skipped, organ/timepoint pairs without any
+        # values are left as nan
+        means = _group_means(cpm.to_numpy(dtype = np.float64).T, 
+                             group, len(organs) * len(timepoints))
+        self.cpm = (np.ascontiguousarray(means.T, dtype = np.float32)
+                    .reshape(len(cpm), len(organs), len(timepoints)))
+        self.genes = cpm.index
+        self._gene_rows = {gene: i for i, gene in enumerate(cpm.index)}
+        self._plot_width = 250
+        self._plot_height = 50
+        self._plot_pad = 2
+        x_step = ((self._plot_width - 2 * self._plot_pad)
+                  / max(len(timepoints) - 1, 1))
+        self._plot_x = self._plot_pad + np.arange(len(timepoints)) * x_step
         
-    def line_plot(self, gene: str) -> dcc.Graph:
-        '''Makes cpm line plot'''
-        fig = px.line(self.cpm.loc[gene].reset_index(),
-                      x = 'timepoint',
-                      y = gene,
-                      color = 'organ',
-                      color_discrete_map = self.color_map,
-                      height = 50,
-                      width = 250,
-                      labels= {'timepoint':'', gene: ''})
-        fig.update_xaxes(showticklabels=False)
-        fig.update_yaxes(showticklabels=False)
-        fig.update_layout(margin = dict(l=0, r=0, t=0, b=0),
-                          showlegend = False)
-        graph = dcc.Graph(figure = fig, 
-                          config = {'staticPlot': True})
-        return graph
+    def line_plot(self, gene: str) -> html.Img:
+        '''Makes cpm line plot, reusing the plot if the gene was seen before'''
+        return self._cached_line_plot(gene)
+
+    def _build_line_plot(self, gene: str) -> html.Img:
+        # a static svg image is much lighter than a plotly graph in a table
+        values = self.cpm[self._gene_rows[gene]]
+        low, high = np.nanmin(values), np.nanmax(values)
+        y_scale = (self._plot_height - 2 * self._plot_pad) / ((high - low) or 1)
+        lines = []
+        for organ, organ_values in zip(self.organs, values):
+            y = self._plot_pad + (high - organ_values) * y_scale
+            sampled = ~np.isnan(y)
+            points = ' '.join(f'{xi:.1f},{yi:.1f}' 
+                              for xi, yi in zip(self._plot_x[sampled], 
+                                                y[sampled]))
+            lines.append(f'<polyline points="{points}" fill="none" '
+                         f'stroke="{self.color_map[organ]}" stroke-width="2"/>')
+        svg = (f'<svg xmlns="http://www.w3.org/2000/svg" '
+               f'width="{self._plot_width}" height="{self._plot_height}">'
+               f'<rect width="100%" height="100%" fill="#E5ECF6"/>'
+               f'{"".join(lines)}</svg>')
+        src = 'data:image/svg+xml;base64,' + b64encode(svg.encode()).decode()
+        img = html.Img(src = src, 
+                       width = self._plot_width, 
+                       height = self._plot_height)
+        return img
     
     def _key_item(self, organ: str) -> html.Li:
         box = html.Div(style = {'height': 10, 
@@ -158,24 +350,92 @@ class CPMPlotter:
         return item
         
 
+class _TopicRanking:
+
+    '''Ranks genes by their score of one sign for a topic. Only the top of 
+       the ranking is sorted, deeper ranks are sorted when first asked for.
+    
+    Attributes:
+        size: int - number of genes with a score of the right sign
+    
+    '''
+
+    def __init__(self, genes: np.ndarray, scores: np.ndarray, sign: int,
+                 min_sorted: int = 200):
+        self._genes = genes
+        self._scores = scores
+        # largest signed score first, keeping only scores of the right sign
+        self._keys = -sign * scores
+        self._candidates = np.flatnonzero(self._keys < 0)
+        self._min_sorted = min_sorted
+        self._order = self._candidates[:0]
+        self.size = len(self._candidates)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def top(self, stop: int):
+        '''Returns (genes, scores) arrays of at least the first stop ranks'''
+        if stop > len(self._order):
+            self._sort(stop)
+        return self._genes[self._order], self._scores[self._order]
+
+    def _sort(self, stop: int):
+        # at least double the sorted depth so deep paging stays linear
+        k = min(max(stop, 2 * len(self._order), self._min_sorted), self.size)
+        keys = self._keys[self._candidates]
+        if k < self.size:
+            top = np.argpartition(keys, k - 1)[:k]
+        else:
+            top = np.arange(self.size)
+        top = top[np.argsort(keys[top])]
+        self._order = self._candidates[top]
+
+
+class _RankedScores(dict):
+
+    '''Maps topics to _TopicRankings of genes. A topic is only ranked the 
+       first time it is looked up.
+    
+    Attributes:
+        score_mat: pd.DataFrame - gene column followed by a column per topic
+        sign: int - 1 to rank positive scores, -1 to rank negative scores
+    
+    '''
+
+    def __init__(self, score_mat: pd.DataFrame, sign: int):
+        super().__init__()
+        self.score_mat = score_mat
+        self.sign = sign
+        self._genes = score_mat['gene'].to_numpy()
+
+    def __missing__(self, topic: str) -> _TopicRanking:
+        ranking = _TopicRanking(self._genes, 
+                                self.score_mat[topic].to_numpy(), 
+                                self.sign)
+        self[topic] = ranking
+        return ranking
+        
+
 class GeneTable:
     
     '''Manages the component for the gene table.
     
     Attributes:
         cpm_plotter: CPMPlotter - plotter for in-table plots
-        pos_scores: Dict - dictionary of positive scores for each tissue
-        neg_scores: Dict - dictionary of negative scores for each tissue
+        pos_scores: Dict - ranking of genes by positive score for each topic
+        neg_scores: Dict - ranking of genes by negative score for each topic
         _table_controls: html.Div - components for controlling the table      
         ids: Dict - names of various components
         ngenes: int - number of genes displayed at a time
+        prefetch_pages: int - pages after the current one sent to the browser
         app: dash.Dash - dash application
     
     '''
 
-    def __init__(self, score_path: str, cpm_plotter: CPMPlotter, 
+    def __init__(self, score_mat: pd.DataFrame, cpm_plotter: CPMPlotter, 
                  app: dash.Dash, score_name: str):
-        self._read_scores(score_path)
+        self._prep_scores(score_mat)
         self.cpm_plotter = cpm_plotter
         self.app = app
         self.score_name = score_name
@@ -184,31 +444,23 @@ class GeneTable:
             'title': f'{score_name}-gene-table-title',
             'forward_button': f'{score_name}-forward-button',
             'back_button': f'{score_name}-back-button',
-            'dropdown': f'{score_name}-neg-pos-dropdown'            
+            'dropdown': f'{score_name}-neg-pos-dropdown',
+            'body': f'{score_name}-gene-table-body',
+            'page_cache': f'{score_name}-page-cache',
+            'start_rank': f'{score_name}-start-rank'
         }
         self._setup_table_controls()
         self.ngenes = 5
-        
+        self.prefetch_pages = 4
+        # a window's rows only depend on topic, sign and start, so switching
+        # the dropdown back or returning to a window is a lookup
+        self._cached_window_rows = functools.lru_cache(maxsize = 256)(
+            self._window_rows
+        )
 
-    def _read_scores(self, score_path: str):
-        score_mat = pd.read_csv(score_path)
-        pos_scores = {}
-        neg_scores = {}
-        for topic in score_mat.columns[1:]:
-            topic_scores = score_mat[['gene', topic]]
-            
-            pos_topic = topic_scores[topic_scores[topic] > 0]
-            pos_topic = pos_topic.sort_values(topic, ascending = False)
-            pos_topic = pos_topic.reset_index(drop=True)
-            pos_scores[topic] = pos_topic
-            
-            neg_topic = topic_scores[topic_scores[topic] < 0]
-            neg_topic = neg_topic.sort_values(topic)
-            neg_topic = neg_topic.reset_index(drop=True)
-            neg_scores[topic] = neg_topic
-            
-        self.pos_scores = pos_scores
-        self.neg_scores = neg_scores
+    def _prep_scores(self, score_mat: pd.DataFrame):
+        self.pos_scores = _RankedScores(score_mat, sign = 1)
+        self.neg_scores = _RankedScores(score_mat, sign = -1)
     
     def _setup_table_controls(self):
         pos_neg_dropdown = dcc.Dropdown(
@@ -237,8 +489,10 @@ class GeneTable:
     def get_component(self) -> html.Div:
         title = html.Div(id = self.ids['title'], 
                          children = self._get_title('k1'))
+        page_cache = self._get_page_cache('k1', 0, True)
+        # rows are filled in by the clientside callback on page load
         table = html.Div(id = self.ids['table'],
-                         children = self._get_table('k1', 0, True))
+                         children = self._get_table())
         key = self.cpm_plotter.organ_key
         table_key = html.Div(
             style = {'display': 'flex'},
@@ -253,7 +507,9 @@ class GeneTable:
             children = [
                 title,
                 self._table_controls,
-                table_key
+                table_key,
+                dcc.Store(id = self.ids['page_cache'], data = page_cache),
+                dcc.Store(id = self.ids['start_rank'], data = 0)
             ]
         )
         return div
@@ -262,10 +518,10 @@ class GeneTable:
         title = html.H2(f'Genes Correlated with {topic}')
         return title
 
-    def _get_table(self, topic: str, start_rank: int, pos: bool) -> html.Table:
+    def _get_table(self) -> html.Table:
         table = html.Table([
             self._table_header(),
-            self._table_body(topic, start_rank, pos)
+            html.Tbody(id = self.ids['body'], children = [])
         ])
         return table
     
@@ -274,56 +530,74 @@ class GeneTable:
             html.Td('rank'), html.Td('gene'), html.Td(self.score_name), html.Td('cpm')
         ])
         return header
-    
-    def _table_body(self, topic: str, start_rank: int, pos: bool) -> html.Tbody:
-        scores = self.pos_scores[topic] if pos else self.neg_scores[topic]
+
+    def _clamp_rank(self, topic: str, start_rank: int, pos: bool) -> int:
+        ranking = self.pos_scores[topic] if pos else self.neg_scores[topic]
         if start_rank < 0: 
             start_rank = 0
-        if start_rank > max(scores.index) - (self.ngenes - 1):
-            start_rank = max(scores.index) - (self.ngenes - 1)
-            
-        rows = [self._table_row(topic, rank, pos) 
-                for rank in range(start_rank, start_rank + self.ngenes)]
-        return html.Tbody(rows)
+        if start_rank > len(ranking) - self.ngenes:
+            start_rank = len(ranking) - self.ngenes
+        return start_rank
+
+    def _window_start(self, start_rank: int) -> int:
+        '''First rank of the cached window that holds the page at start_rank'''
+        window = self.ngenes * self.prefetch_pages
+        return start_rank // window * window
+
+    def _get_page_cache(self, topic: str, start_rank: int, pos: bool) -> Dict:
+        '''Makes the row data for the window of pages around start_rank, which
+           the browser turns into table rows and pages through without going 
+           back to the server'''
+        ranking = self.pos_scores[topic] if pos else self.neg_scores[topic]
+        start_rank = self._clamp_rank(topic, start_rank, pos)
+        window_start = self._window_start(start_rank)
+        page_cache = {
+            'ngenes': self.ngenes,
+            'total': len(ranking),
+            'start': window_start,
+            'page': start_rank,
+            'rows': self._cached_window_rows(topic, pos, window_start)
+        }
+        return page_cache
+
+    def _window_rows(self, topic: str, pos: bool, 
+                     window_start: int) -> List[Dict]:
+        ranking = self.pos_scores[topic] if pos else self.neg_scores[topic]
+        window_end = min(window_start + self.ngenes * (self.prefetch_pages + 1),
+                         len(ranking))
+        genes, scores = ranking.top(window_end)
+        rows = [self._row_data(genes, scores, rank) 
+                for rank in range(window_start, window_end)]
+        return rows
             
-    def _table_row(self, topic: str, rank: int, pos: bool):
-        scores = self.pos_scores[topic] if pos else self.neg_scores[topic]
-        gene = scores.loc[rank, 'gene']
-        score = scores.loc[rank, topic]
-        plot = self.cpm_plotter.line_plot(gene)
-        
-        row = html.Tr([
-            html.Td(rank),
-            html.Td(gene),
-            html.Td(score),
-            html.Td(plot)
-        ])
+    def _row_data(self, genes: np.ndarray, scores: np.ndarray, 
+                  rank: int) -> Dict:
+        gene = genes[rank]
+        row = {
+            'rank': rank,
+            'gene': gene,
+            'score': scores[rank],
+            'cpm': self.cpm_plotter.line_plot(gene)
+        }
         return row
 
     def _topic_from_title(self, title):
         title_str = title['props']['children']
         return title_str.split()[-1]
-    
-    def _rank_from_table(self, table: html.Table):
-        body = table['props']['children'][1]
-        first_row = body['props']['children'][0]
-        rank_cell = first_row['props']['children'][0]
-        start_rank = rank_cell['props']['children']
-        return start_rank
 
     def register(self):
         '''Register associated callbacks with the dash app'''
         
         @self.app.callback(
-            dash.dependencies.Output(self.ids['table'], 'children'),
-            [dash.dependencies.Input(self.ids['title'], 'children'),
-             dash.dependencies.Input(self.ids['dropdown'], 'value'),
-             dash.dependencies.Input(self.ids['forward_button'], 'n_clicks'),
-             dash.dependencies.Input(self.ids['back_button'], 'n_clicks')],
-            state = [dash.dependencies.State(self.ids['table'], 'children')]
+            Output(self.ids['page_cache'], 'data'),
+            [Input(self.ids['title'], 'children'),
+             Input(self.ids['dropdown'], 'value'),
+             Input(self.ids['forward_button'], 'n_clicks'),
+             Input(self.ids['back_button'], 'n_clicks')],
+            [State(self.ids['start_rank'], 'data')]
         )
-        def update_table(title, dropdown, 
-                         forward, back, table) -> html.Table:
+        def update_page_cache(title, dropdown, 
+                              forward, back, start_rank) -> Dict:
             ctx = dash.callback_context
             
             if not ctx.triggered:
@@ -333,21 +607,37 @@ class GeneTable:
             topic = self._topic_from_title(title)
             pos = dropdown == 'pos'
             if trigger_id in [self.ids['title'], self.ids['dropdown']]:
-                return self._get_table(topic = topic, start_rank = 0, pos = pos)
+                return self._get_page_cache(topic = topic, start_rank = 0, 
+                                            pos = pos)
             
-            start_rank = self._rank_from_table(table)
             if trigger_id == self.ids['forward_button']:
-                return self._get_table(topic = topic, 
-                                       start_rank = start_rank + self.ngenes,
-                                       pos = pos)
+                new_rank = start_rank + self.ngenes
             else:
-                return self._get_table(topic = topic,
-                                       start_rank = start_rank - self.ngenes,
-                                       pos = pos)
+                new_rank = start_rank - self.ngenes
+            new_rank = self._clamp_rank(topic, new_rank, pos)
+            # pages in the current window are shown by the browser
+            if self._window_start(new_rank) == self._window_start(start_rank):
+                raise dash.exceptions.PreventUpdate
+            return self._get_page_cache(topic = topic, 
+                                        start_rank = new_rank,
+                                        pos = pos)
+
+        self.app.clientside_callback(
+            ClientsideFunction(
+                namespace = 'gene_table',
+                function_name = 'show_page'
+            ),
+            [Output(self.ids['body'], 'children'),
+             Output(self.ids['start_rank'], 'data')],
+            [Input(self.ids['page_cache'], 'data'),
+             Input(self.ids['forward_button'], 'n_clicks'),
+             Input(self.ids['back_button'], 'n_clicks')],
+            [State(self.ids['start_rank'], 'data')]
+        )
                 
         @self.app.callback(
-            dash.dependencies.Output(self.ids['title'], 'children'),
-            [dash.dependencies.Input('topic-timecourse', 'clickData')]
+            Output(self.ids['title'], 'children'),
+            [Input('topic-timecourse', 'clickData')]
         )
         def update_title(timecourse_click):
             if timecourse_click is None: